@@ -10,8 +10,7 @@ from matplotlib import pyplot as plt
 
 import frames
 import resources
-from classes.event import Event
-from streaming import SequentialStreamingExecutor as Executor
+from streaming import PrefetchingStreamingExecutor as Executor
 
 INTERVAL = 5.0
 M = 1.0
@@ -19,84 +18,76 @@ R = 1.5e-3
 X_MAX = 0.18
 Y_MAX = 0.09
 
-CHAMBERS: dict[int, tuple[str, str]] = {
-    0: ('left', 'horizontal'),
-    1: ('center', 'vertical'),
-    2: ('right', 'horizontal'),
-    3: ('right', 'vertical'),
-    4: ('right', 'horizontal'),
-    5: ('center', 'vertical'),
-    6: ('left', 'horizontal'),
-    7: ('left', 'vertical')
-}
+# Chamber of each wall ID (0: left, 1: center, 2: right)
+CHAMBER = np.array([0, 1, 2, 2, 2, 1, 0, 0], dtype=np.int8)
+
+# Whether each wall ID is horizontal
+HORIZONTAL = np.array([True, False, True, False, True, False, True, False])
 
 def main(cut: int = 60, dry: bool = False):
-    with open(resources.path('events.txt'), 'r') as file:
-        events = [
-            Event(i, line.strip().split(' '))
-            for i, line in enumerate(file)
-                if line.strip() and line.strip().split(' ')[1] in ['WALL', 'VERTEX']
-        ]
+    data = np.loadtxt(
+        resources.path('events.txt'),
+        dtype=[('time', 'f8'), ('type', 'U8'), ('a', 'i4'), ('b', 'i4')],
+        ndmin=1
+    )
+
+    # Line index of every wall/vertex event, which is also its step file
+    ev_id = np.flatnonzero(np.isin(data['type'], ['WALL', 'VERTEX']))
+    events = data[ev_id]
 
-    checkpoints: list[int] = []
-    previous = 0.0
+    ev_time = events['time']
+    ev_is_wall = events['type'] == 'WALL'
+    ev_a = events['a']
+    ev_b = events['b']
 
-    for i, e in enumerate(events):
-        if e.time > previous + INTERVAL:
-            checkpoints.append(i)
-            previous = e.time
+    checkpoints = frames.checkpoint_indices(ev_time, INTERVAL)
 
-    executor = Executor(frames.next, [e.id for e in events])
+    executor = Executor(frames.velocities, ev_id.tolist())
 
     with open(resources.path("setup.txt")) as f:
         count, L = [*map(float, f.readline().strip().split())]
         count = int(count)
 
-    pressures_izq: list[float] = []
-    pressures_der: list[float] = []
-    times: list[float] = []
-
-    total_impulse_izq = 0.0
-    total_impulse_cen = 0.0
-    total_impulse_der = 0.0
-
-    for i, particles in tqdm(enumerate(executor.stream()), total=len(events)):
-        if i in checkpoints:
-            PL = total_impulse_izq / (INTERVAL * Y_MAX * 3)
-            PR = total_impulse_der / (INTERVAL * (Y_MAX * 2 + L))
+    # Velocity of the particle involved in each event
+    selected = np.empty((len(events), 2))
 
-            pressures_izq.append(PL)
-            pressures_der.append(PR)
-            times.append(events[i].time)
+    try:
+        bar = tqdm(
+            enumerate(executor.stream()),
+            total=len(events),
+            miniters=max(1, len(events) // 200),
+            mininterval=0.5
+        )
 
-            total_impulse_izq = 0.0
-            total_impulse_cen = 0.0
-            total_impulse_der = 0.0
+        for i, velocities in bar:
+            selected[i] = velocities[ev_a[i] - 2]
+    finally:
+        executor.close()
 
-        P = particles[events[i].a - 2]
-        # x, y = p.position.tuple()
-        vx, vy = P.velocity.tuple()
+    vx, vy = selected[:, 0], selected[:, 1]
 
-        if events[i].type != 'WALL':
-            total_impulse_cen += 2 * M * P.velocity.norm()
-            continue
+    # Speed transferred on each collision, the 2M factor is applied per interval
+    # Vertex collisions are accounted for in the center chamber
+    speed = np.where(ev_is_wall, np.abs(np.where(HORIZONTAL[ev_b], vx, vy)), np.hypot(vx, vy))
+    chamber = np.where(ev_is_wall, CHAMBER[ev_b], 1)
 
-        WALL_ID = events[i].b
-        chamber, orientation = CHAMBERS[WALL_ID]
+    # Each checkpoint closes the interval of the events preceding it,
+    # events after the last checkpoint are discarded
+    K = len(checkpoints)
+    interval = np.searchsorted(checkpoints, np.arange(len(events)), side='right')
+    speeds = np.bincount(interval * 3 + chamber, weights=speed, minlength=(K + 1) * 3).reshape(K + 1, 3)[:K]
 
-        J = 2 * M * abs(vx if orientation == 'horizontal' else vy)
+    NORM_IZQ = 2 * M / (INTERVAL * Y_MAX * 3)
+    NORM_DER = 2 * M / (INTERVAL * (Y_MAX * 2 + L))
 
-        if chamber == 'left':
-            total_impulse_izq += J
-        elif chamber == 'center':
-            total_impulse_cen += J
-        elif chamber == 'right':
-            total_impulse_der += J
+    pressures_izq = speeds[:, 0] * NORM_IZQ
+    pressures_der = speeds[:, 2] * NORM_DER
+    times = ev_time[checkpoints]
 
     I0 = next(i for i, t in enumerate(times) if t >= cut)
 
-    prom_izq = np.mean(pressures_izq[I0:])
-    prom_der = np.mean(pressures_der[I0:])
+    prom_izq = pressures_izq[I0:].mean()
+    prom_der = pressures_der[I0:].mean()
 
     if not dry:
         dir = resources.path("pressure", str(L))
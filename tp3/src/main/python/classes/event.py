@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-@dataclass(frozen=True, init=False)
+@dataclass(frozen=True, slots=True, init=False)
 class Event:
     id: int
     time: float
@@ -1,6 +1,7 @@
+import math
 from dataclasses import dataclass
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Vector:
     x: float
     y: float
@@ -24,7 +25,7 @@ class Vector:
         return self.x * other.x + self.y * other.y
 
     def norm(self) -> float:
-        return (self.x**2 + self.y**2) ** 0.5
+        return math.hypot(self.x, self.y)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Vector):
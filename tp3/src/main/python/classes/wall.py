@@ -2,7 +2,7 @@ from dataclasses import dataclass
 
 from classes.vector import Vector
 
-@dataclass(frozen=True, init=False)
+@dataclass(frozen=True, slots=True, init=False)
 class Wall:
     start: Vector
     end: Vector
@@ -1,7 +1,5 @@
 import sys
 
-import numpy as np
-
 from errors import fitter, origin, plot, FIT, LINEAR
 from pa import main as pressure_math, study
 
@@ -12,8 +10,8 @@ def main(F: FIT):
         sys.exit(1)
 
     RESULTS = pressure_math(STUDY[0])
-    X = np.array(RESULTS[0])
-    Y = np.array(RESULTS[1])
+    X = RESULTS[0]
+    Y = RESULTS[1]
 
     C, E, MIN_X, MIN_Y = fitter(X, Y, F, 0, 0.027)
 
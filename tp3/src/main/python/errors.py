@@ -1,26 +1,47 @@
+import math
 from typing import Callable
+from functools import lru_cache
 
 import matplotlib.pyplot as plt
 import numpy as np
 
-FIT = Callable[[np.ndarray, float], np.ndarray]
+FIT = Callable[[np.ndarray, np.ndarray], np.ndarray]
 
 def truncate_at_most_2(n: float) -> str:
     TRUNC = int(n * 100) / 100
     return str(TRUNC).rstrip('0').rstrip('.')
 
+# Tick labels repeat across redraws, so cache the formatted strings
+@lru_cache(maxsize=256)
 def sci_notation(val: float, _):
     if val == 0:
         return "0"
 
-    EXP = int(np.floor(np.log10(abs(val))))
+    EXP = math.floor(math.log10(abs(val)))
     COEFF = val / (10**EXP)
 
     return f"{truncate_at_most_2(COEFF)}\\times 10^{{{EXP}}}"
 
 def fitter(X: np.ndarray, Y: np.ndarray, F: FIT, LEFT: float, RIGHT: float) -> tuple[np.ndarray, np.ndarray, float, float]:
     C = np.linspace(LEFT, RIGHT, 1000)
-    E = np.array([np.sum((Y - F(X, c)) ** 2) for c in C])
+
+    if isinstance(F, LINEAR):
+        # E(c) = sum((Y - B - c X)^2) is a parabola in c, solve it instead of sampling
+        R = Y - F.B
+        A = np.dot(X, X)
+        K = np.dot(X, R)
+
+        E = (A * C - 2 * K) * C + np.dot(R, R)
+
+        # With every X at zero E is flat, the grid's argmin would pick its first point
+        MIN_X = float(np.clip(K / A, LEFT, RIGHT)) if A > 0 else LEFT
+        MIN_Y = float(np.sum((R - MIN_X * X) ** 2))
+
+        return C, E, MIN_X, MIN_Y
+
+    # Evaluate F for every c at once, one row of residuals per c
+    R = Y[None, :] - F(X[None, :], C[:, None])
+    E = np.sum(R ** 2, axis=1)
 
     MIN = np.argmin(E)
     MIN_X = C[MIN]
@@ -47,10 +68,22 @@ def plot(C: np.ndarray, E: np.ndarray, MIN_X: float, MIN_Y: float):
     plt.show() # pyright: ignore[reportUnknownMemberType]
 
 def origin(P1: tuple[float, float], P2: tuple[float, float]):
-    M = (P2[1] - P1[1]) / (P2[0] - P1[0])
-    return P1[1] - M * P1[0]
+    # Points may come in as numpy scalars, plain floats are cheaper for this arithmetic
+    X1, Y1 = map(float, P1)
+    X2, Y2 = map(float, P2)
+
+    M = (Y2 - Y1) / (X2 - X1)
+    return Y1 - M * X1
+
+class LINEAR:
+    """
+    Line with a fixed origin B, the slope c is the parameter to fit.
+
+    Kept as a class so fitter can recognize it and use the closed-form solution.
+    """
+
+    def __init__(self, B: float):
+        self.B = B
 
-def LINEAR(B: float):
-    def f(X: np.ndarray, c: float):
-        return c * X + B
-    return f
+    def __call__(self, X: np.ndarray, c: np.ndarray):
+        return c * X + self.B
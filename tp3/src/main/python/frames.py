@@ -1,31 +1,60 @@
 from functools import cache
 
-from classes.particle import Particle
+import numpy as np
+
 import resources
 
-@cache
-def checkpoints(interval: float = 0.015):
-    with open(resources.path('events.txt'), 'r') as file:
-        event_times = [float(line.strip().split(' ')[0]) for line in file if line.strip()]
+def checkpoint_indices(times: np.ndarray, interval: float) -> list[int]:
+    """
+    Finds the first event after each interval, measured from the previous checkpoint.
+
+    Jumps from one checkpoint to the next with a binary search,
+    so the cost depends on the number of checkpoints instead of events.
 
-    checkpoints: list[int] = []
-    previous = 0.0
+    :param times: The sorted event times.
+    :param interval: The minimum time between checkpoints.
+    :return: The indices of the checkpoint events.
+    """
+    indices: list[int] = []
 
-    for i, time in enumerate(event_times):
-        if time > previous + interval:
-            checkpoints.append(i)
-            previous = time
+    i = int(np.searchsorted(times, interval, side='right'))
+    while i < len(times):
+        indices.append(i)
+        i = int(np.searchsorted(times, times[i] + interval, side='right'))
 
-    return checkpoints
+    return indices
+
+@cache
+def checkpoints(interval: float = 0.015):
+    event_times = np.loadtxt(resources.path('events.txt'), usecols=0, ndmin=1)
+    return checkpoint_indices(event_times, interval)
 
 def next(f: int):
     """
     Reads the input file for a given frame.
+
+    :return: The frame index and a (N, 4) array with the (x, y, vx, vy) of every particle.
+    """
+    file_path = resources.path('steps', f"{f}.txt")
+    return f, np.loadtxt(file_path, ndmin=2)
+
+def positions(f: int):
+    """
+    Reads only the particle positions for a given frame, as float32 to halve what workers send back.
+
+    :return: The frame index and a (N, 2) array with the (x, y) of every particle.
+    """
+    file_path = resources.path('steps', f"{f}.txt")
+    return f, np.loadtxt(file_path, usecols=(0, 1), ndmin=2, dtype=np.float32)
+
+def velocities(f: int):
+    """
+    Reads only the particle velocities for a given frame.
+
+    :return: The frame index and a (N, 2) array with the (vx, vy) of every particle.
     """
     file_path = resources.path('steps', f"{f}.txt")
-    with open(file_path, 'r') as file:
-        # Iterate through the lines and convert them to Particles
-        return f, [Particle(*map(float, line.strip().split())) for line in file]
+    return f, np.loadtxt(file_path, usecols=(2, 3), ndmin=2)
 
 @cache
 def count():
@@ -1,6 +1,9 @@
 import os
 import sys
+import math
 from typing import Callable
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FuncFormatter
@@ -52,28 +55,52 @@ def study(name: str):
         'pa': study(PA, (r"$L$ $(m)$", r"$‹P›A$ $(Nm)$"))
     }.get(name)
 
+def left_pressure(path: str) -> float:
+    with open(path, 'r') as file:
+        left, _ = map(float, file.readline().split())
+        return left
+
 def main(val: Study):
-    X:   list[float]       = []
-    Y:   list[float]       = []
-    ERR: list[np.floating] = []
+    groups: list[tuple[Fx, list[str]]] = []
+    # scandir gets the entry types from the directory listing, without a stat per entry
+    with os.scandir(resources.path('pressure')) as it:
+        lengths = [e.name for e in it if e.is_dir()]
 
-    for L in os.listdir(resources.path('pressure')):
+    for L in lengths:
         F = val.get(L, None)
 
         if F is None:
             print(f"Skipping L={L} (no study function)")
             continue
 
-        pressures: list[float] = []
-        for filename in os.listdir(resources.path(f'pressure', L)):
-            with open(resources.path(f'pressure', L, filename), 'r') as file:
-                left, _ = [*map(float, file.readline().strip().split())]
-                pressures.append(left)
+        with os.scandir(resources.path('pressure', L)) as it:
+            paths = [e.path for e in it if e.is_file()]
+        if paths:
+            groups.append((F, paths))
+
+    if not groups:
+        return np.empty(0), np.empty(0), np.empty(0)
+
+    COUNTS = np.array([len(paths) for _, paths in groups], dtype=np.int64)
+    STARTS = np.cumsum(COUNTS) - COUNTS
+
+    # Reading is I/O bound, so the threads overlap the open/read syscalls
+    with ThreadPoolExecutor() as pool:
+        pressures = np.fromiter(
+            pool.map(left_pressure, (path for _, paths in groups for path in paths)),
+            dtype=np.float64,
+            count=int(COUNTS.sum())
+        )
+
+    # Every L is a contiguous segment of the flat array, reduce them all at once
+    MEANS = np.add.reduceat(pressures, STARTS) / COUNTS
+    DEVIATIONS = pressures - np.repeat(MEANS, COUNTS)
+    ERR = np.sqrt(np.add.reduceat(DEVIATIONS ** 2, STARTS) / COUNTS)
 
-        x, y = F(float(np.mean(pressures)))
-        X.append(x)
-        Y.append(y)
-        ERR.append(np.std(pressures))
+    X = np.empty(len(groups))
+    Y = np.empty(len(groups))
+    for i, ((F, _), mean) in enumerate(zip(groups, MEANS.tolist())):
+        X[i], Y[i] = F(mean)
 
     return X, Y, ERR
 
@@ -81,11 +108,13 @@ def truncate_at_most_2(n: float) -> str:
     TRUNC = int(n * 100) / 100
     return str(TRUNC).rstrip('0').rstrip('.')
 
+# Tick labels repeat across redraws, so cache the formatted strings
+@lru_cache(maxsize=256)
 def sci_notation(val: float, _):
     if val == 0:
         return "0"
 
-    EXP = int(np.floor(np.log10(abs(val))))
+    EXP = math.floor(math.log10(abs(val)))
     COEFF = val / (10**EXP)
 
     return rf"${truncate_at_most_2(COEFF)}\times 10^{{{EXP}}}$"
@@ -110,7 +139,7 @@ if __name__ == '__main__':
     if FIT:
         LINE = np.linspace(X[0], X[-1], 1000)
         B = origin((X[0], Y[0]), (X[-1], Y[-1]))
-        _, _, M, _ = fitter(np.array(X), np.array(Y), LINEAR(B), 0, 0.027)
+        _, _, M, _ = fitter(X, Y, LINEAR(B), 0, 0.027)
         plt.plot(LINE, M * LINE + B, color='red') # pyright: ignore[reportUnknownMemberType]
 
     plt.xticks(X, fontsize=FS) # pyright: ignore[reportUnknownMemberType]
@@ -13,27 +13,93 @@ Example:
 0,234567890 PARTICLE 15 87 # Particle 15 hits particle 87 at time 0.234567890
 """
 
+import io
+import os
+
 import numpy as np
 import matplotlib.pyplot as plt
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from tqdm import tqdm
 import resources
 
 MAX_FILES = 2 ** 31 - 1; 
+READ_BUFFER = 16 * 1024 * 1024  # bytes of events.txt read and parsed per batch, bounds the text held in memory
+
+# Collision type codes stored in CollisionEvents.collision_type
+WALL = 0
+PARTICLE = 1
+VERTEX = 2
+UNKNOWN = 255
+
+# Collision type code by the first byte of the type name
+TYPE_CODES = np.full(256, UNKNOWN, dtype=np.uint8)
+TYPE_CODES[ord('W')] = WALL
+TYPE_CODES[ord('P')] = PARTICLE
+TYPE_CODES[ord('V')] = VERTEX
+
+# Row layout of events.txt as parsed by np.loadtxt, the type keeps only its first byte
+EVENT_DTYPE = np.dtype([('time', np.float64), ('type', 'S1'), ('particle', np.int32), ('target', np.int32)])
+
+
+def parse_event_lines(text: bytes, first_line: int = 0) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Parse events.txt lines one at a time, skipping the malformed ones.
+
+    Slower than a single np.loadtxt call, but one bad line only costs itself.
+
+    :param text: Lines of events.txt, with '.' as decimal separator.
+    :param first_line: Index in events.txt of the first line of text.
+    :return: The parsed events, the events.txt line index of each and the number of lines skipped.
+    """
+    rows: list[tuple[float, bytes, int, int]] = []
+    line_index: list[int] = []
+    skipped = 0
+
+    lines = text.split(b'\n')
+    if not lines[-1]:
+        lines.pop()  # Nothing follows the last line break
+
+    for line_idx, line in enumerate(lines, first_line):
+        line_num = line_idx + 1
+        parts = line.split()
+
+        if len(parts) >= 4:
+            try:
+                rows.append((float(parts[0]), parts[1][:1], int(parts[2]), int(parts[3])))
+                line_index.append(line_idx)
+            except ValueError as e:
+                print(f"Error parsing line {line_num}: {line.strip().decode(errors='replace')}")
+                print(f"Error: {e}")
+                skipped += 1
+        else:
+            if line_num <= 5:  # Show first few parsing issues
+                print(f"Skipping malformed line {line_num}: {line.strip().decode(errors='replace')}")
+            skipped += 1
+
+    return np.array(rows, dtype=EVENT_DTYPE), np.array(line_index, dtype=np.int64), skipped
+
 
 @dataclass
-class CollisionEvent:
-    time: float
-    collision_type: str  # "PARTICLE" or "WALL"
-    particle_id: int
-    target_id: int  # wall ID for wall collisions, particle ID for particle collisions
+class CollisionEvents:
+    """Collision events as parallel arrays, one entry per event"""
+    time: np.ndarray            # float64
+    collision_type: np.ndarray  # uint8, one of WALL, PARTICLE, VERTEX or UNKNOWN
+    particle_id: np.ndarray     # int32
+    target_id: np.ndarray       # int32, wall ID for wall collisions, particle ID for particle collisions
+
+    def __len__(self) -> int:
+        return len(self.time)
 
 
 @dataclass 
 class PressureData:
-    time: list[float]
-    left_pressure: list[float]
-    right_pressure: list[float]
+    time: np.ndarray
+    left_pressure: np.ndarray
+    right_pressure: np.ndarray
+
+    @classmethod
+    def empty(cls) -> 'PressureData':
+        return cls(np.empty(0), np.empty(0), np.empty(0))
 
 
 class SimplifiedPressureAnalyzer:
@@ -42,6 +108,7 @@ class SimplifiedPressureAnalyzer:
     def __init__(self, events_per_bin: int = 200):
         self.events_per_bin = events_per_bin
         self.time_bin_size = None  # Will be calculated adaptively
+        self.wall_impulse_bins = None  # (n_bins, n_walls) impulse per time bin and wall, filled by calculate_pressure_evolution
         
         # Wall chamber mapping (from Wall.java generate method)
         self.wall_chambers = {
@@ -55,78 +122,123 @@ class SimplifiedPressureAnalyzer:
             7: 'left'     # Left wall
         }
         
+        # Chamber index per wall ID (0 = left, 1 = right), the dict above is kept for printing
+        self.chamber_of = np.array(
+            [self.wall_chambers[i] == 'right' for i in range(len(self.wall_chambers))],
+            dtype=np.uint8
+        )
+        
         # Chamber perimeters for pressure normalization
         # Left: 0.09×0.09 square minus 0.07 opening = 2*(0.09+0.09) - 0.07
         # Right: 0.09×0.07 rectangle = 2*(0.09+0.07)
         self.left_perimeter = 2 * (0.09 + 0.09) - 0.07  # 0.29m
         self.right_perimeter = 2 * (0.09 + 0.07)        # 0.32m
     
-    def parse_float(self, value_str: str) -> float:
-        """Parse float with comma as decimal separator"""
-        return float(value_str.replace(',', '.'))
-    
-    def load_collision_events(self, max_events: int | None = None) -> list[CollisionEvent]:
-        """Load collision events from events.txt"""
+    def load_collision_events(self, max_events: int | None = None) -> CollisionEvents:
+        """Load collision events from events.txt, reusing the parsed arrays when they are up to date"""
         
         print("Loading collision events...")
-        events: list[CollisionEvent] = []
+        source = resources.path("events.txt")
+        cache = resources.path("events.npz")
+
+        if os.path.exists(cache) and os.path.getmtime(cache) > os.path.getmtime(source):
+            with np.load(cache) as data:
+                events = CollisionEvents(**{name: data[name][:max_events or None] for name in data.files})
+        else:
+            events = self.parse_collision_events(source, max_events)
+
+            # Only a parse that reached the end of the file can stand in for it
+            if not max_events or len(events) < max_events:
+                np.savez(cache, **{field.name: getattr(events, field.name) for field in fields(events)})
 
-        with open(resources.path("events.txt")) as f:
-            for line_num, line in enumerate(f, 1):
-                parts = line.strip().split()
-                
-                if len(parts) >= 4:
-                    try:
-                        time = self.parse_float(parts[0])
-                        collision_type = parts[1]
-                        particle_id = int(parts[2])
-                        target_id = int(parts[3])
-                        
-                        events.append(CollisionEvent(time, collision_type, particle_id, target_id))
-                        
-                        if max_events and len(events) >= max_events:
-                            break
-                            
-                    except ValueError as e:
-                        print(f"Error parsing line {line_num}: {line.strip()}")
-                        print(f"Error: {e}")
-                        continue
-                else:
-                    if line_num <= 5:  # Show first few parsing issues
-                        print(f"Skipping malformed line {line_num}: {line.strip()}")
-        
         print(f"Loaded {len(events)} collision events")
         return events
     
-    def analyze_collision_distribution(self, events: list[CollisionEvent]):
+    def parse_collision_events(self, source: str, max_events: int | None = None) -> CollisionEvents:
+        """Parse collision events from the events.txt text format"""
+
+        # Parse in blocks of whole lines, so only one block of raw text is alive at a time
+        chunks = [np.empty(0, dtype=EVENT_DTYPE)]
+        with open(source, 'rb') as f:
+            # The file is read front to back once, let the kernel read ahead aggressively
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            # One progress tick per block, measured in bytes of the file
+            line_num = 0
+            skipped = 0
+            tail = b''
+            with tqdm(total=os.path.getsize(source), unit='B', unit_scale=True, desc="Parsing events") as bar:
+                while not max_events or line_num < max_events:
+                    block = f.read(READ_BUFFER)
+                    bar.update(len(block))
+
+                    # Cut after the last full line, the partial line left over opens the next block
+                    data = tail + block
+                    if not block and data and not data.endswith(b'\n'):
+                        data += b'\n'  # Last line of the file without a line break
+                    cut = data.rfind(b'\n') + 1
+                    chunk, tail = data[:cut], data[cut:]
+                    if not chunk:
+                        if not block:
+                            break
+                        continue
+
+                    # max_rows would preallocate max_events rows, so cut the block after the last wanted line instead
+                    n_lines = chunk.count(b'\n')
+                    if max_events and line_num + n_lines > max_events:
+                        line_ends = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord('\n'))
+                        n_lines = max_events - line_num
+                        chunk = chunk[:line_ends[n_lines - 1] + 1]
+
+                    # Normalize comma decimals so numpy's C parser reads the whole block in one call
+                    text = chunk.replace(b',', b'.')
+                    try:
+                        chunks.append(np.loadtxt(io.BytesIO(text), dtype=EVENT_DTYPE, ndmin=1))
+                    except ValueError:
+                        # A malformed line spoils the whole block, redo only this block line by line
+                        parsed, _, bad = parse_event_lines(text, line_num)
+                        chunks.append(parsed)
+                        skipped += bad
+                    line_num += n_lines
+
+        if skipped:
+            print(f"Skipped {skipped} malformed lines")
+
+        # Gather each field across batches into its own contiguous column
+        return CollisionEvents(
+            np.concatenate([c['time'] for c in chunks]),
+            TYPE_CODES[np.concatenate([c['type'] for c in chunks]).view(np.uint8)],
+            np.concatenate([c['particle'] for c in chunks]),
+            np.concatenate([c['target'] for c in chunks])
+        )
+    
+    def analyze_collision_distribution(self, events: CollisionEvents):
         """Analyze the distribution of collision types and wall hits"""
         
-        wall_events = [e for e in events if e.collision_type == "WALL"]
-        particle_events = [e for e in events if e.collision_type == "PARTICLE"]
+        wall_mask = events.collision_type == WALL
+        n_wall = int(np.count_nonzero(wall_mask))
+        n_particle = int(np.count_nonzero(events.collision_type == PARTICLE))
         
         print(f"\\nCollision Distribution:")
-        print(f"Wall collisions: {len(wall_events)} ({len(wall_events)/len(events)*100:.1f}%)")
-        print(f"Particle collisions: {len(particle_events)} ({len(particle_events)/len(events)*100:.1f}%)")
+        print(f"Wall collisions: {n_wall} ({n_wall/len(events)*100:.1f}%)")
+        print(f"Particle collisions: {n_particle} ({n_particle/len(events)*100:.1f}%)")
         
         # Analyze wall collision distribution
-        if wall_events:
-            wall_counts: dict[int, int] = {}
-            for event in wall_events:
-                wall_id = event.target_id
-                wall_counts[wall_id] = wall_counts.get(wall_id, 0) + 1
+        if n_wall:
+            wall_ids, counts = np.unique(events.target_id[wall_mask], return_counts=True)
             
-            print(f"\\nWall Collision Distribution:")
-            left_total = 0
-            right_total = 0
+            # Chamber name per wall ID, IDs outside the table are 'unknown'
+            chamber_names = np.array(['left', 'right'])[self.chamber_of]
+            known = (wall_ids >= 0) & (wall_ids < len(chamber_names))
+            chambers = np.where(known, chamber_names[np.where(known, wall_ids, 0)], 'unknown')
             
-            for wall_id, count in sorted(wall_counts.items()):
-                chamber = self.wall_chambers.get(wall_id, 'unknown')
+            print(f"\\nWall Collision Distribution:")
+            for wall_id, chamber, count in zip(wall_ids.tolist(), chambers.tolist(), counts.tolist()):
                 print(f"Wall {wall_id} ({chamber}): {count} collisions")
-                
-                if chamber == 'left':
-                    left_total += count
-                elif chamber == 'right':
-                    right_total += count
+            
+            left_total = int(counts[chambers == 'left'].sum())
+            right_total = int(counts[chambers == 'right'].sum())
             
             print(f"\\nChamber Totals:")
             print(f"Left chamber: {left_total} wall collisions")
@@ -138,22 +250,25 @@ class SimplifiedPressureAnalyzer:
         
         # Load events
         events = self.load_collision_events(max_events)
-        if not events:
-            return PressureData([], [], [])
+        if not len(events):
+            return PressureData.empty()
         
         # Analyze collision distribution
         self.analyze_collision_distribution(events)
         
         # Filter wall collisions
-        wall_events = [e for e in events if e.collision_type == "WALL"]
+        wall_mask = events.collision_type == WALL
+        wall_times = events.time[wall_mask]
+        wall_ids = events.target_id[wall_mask]
         
-        if not wall_events:
+        if not len(wall_times):
             print("Error: No wall collisions found!")
-            return PressureData([], [], [])
+            return PressureData.empty()
         
         # Calculate adaptive time bin size based on events per bin
-        max_time = max(e.time for e in events)
-        total_wall_events = len(wall_events)
+        # events.txt is written in simulation order, so the last event is the latest
+        max_time = float(events.time[-1])
+        total_wall_events = len(wall_times)
         
         # Calculate bin size to get approximately events_per_bin wall collisions per bin
         if total_wall_events > 0:
@@ -163,10 +278,6 @@ class SimplifiedPressureAnalyzer:
             n_bins = 1
             self.time_bin_size = max_time
         
-        time_centers = [(i + 0.5) * self.time_bin_size for i in range(n_bins)]
-        left_impulse_bins = [0.0] * n_bins
-        right_impulse_bins = [0.0] * n_bins
-        
         print(f"\\nAdaptive Binning:")
         print(f"Total wall events: {total_wall_events}")
         print(f"Target events per bin: {self.events_per_bin}")
@@ -174,47 +285,40 @@ class SimplifiedPressureAnalyzer:
         print(f"Time bin size: {self.time_bin_size:.6f} s")
         print(f"Expected events per bin: {total_wall_events/n_bins:.1f}")
         
-        print(f"\\nProcessing {len(wall_events)} wall collisions into {n_bins} time bins...")
+        print(f"\\nProcessing {total_wall_events} wall collisions into {n_bins} time bins...")
         
         # Process wall collisions
-        processed = 0
-        for event in tqdm(wall_events, desc="Processing wall collisions"):
-            time_bin = int(event.time / self.time_bin_size)
-            
-            if time_bin >= n_bins:
-                continue
-            
-            # Get chamber from wall ID
-            wall_id = event.target_id
-            chamber = self.wall_chambers.get(wall_id, 'unknown')
-            
-            if chamber == 'unknown':
-                continue
-            
-            # Use unit impulse per collision (simplified model)
-            # In reality, this should be calculated from velocity changes
-            impulse = 1.0
-            
-            # Assign to appropriate chamber
-            if chamber == 'left':
-                left_impulse_bins[time_bin] += impulse
-            elif chamber == 'right':
-                right_impulse_bins[time_bin] += impulse
-            
-            processed += 1
+        # Use unit impulse per collision (simplified model), so the impulse is the hit count
+        # In reality, this should be calculated from velocity changes
+        # Bin time and wall ID together with one flat bincount over the (time bin, wall) cells
+        n_walls = len(self.chamber_of)
+        # IDs outside the chamber table are dropped, a flat index would spill them into a neighbouring cell
+        known = (wall_ids >= 0) & (wall_ids < n_walls)
+        
+        # The latest event sits exactly on max_time, keep it in the last bin
+        time_bins = np.minimum((wall_times[known] / self.time_bin_size).astype(np.intp), n_bins - 1)
+        self.wall_impulse_bins = np.bincount(
+            time_bins * n_walls + wall_ids[known],
+            minlength=n_bins * n_walls
+        ).reshape(n_bins, n_walls).astype(np.float64)
+        
+        # Reduce the walls to their chambers
+        left_impulse_bins = self.wall_impulse_bins[:, self.chamber_of == 0].sum(axis=1)
+        right_impulse_bins = self.wall_impulse_bins[:, self.chamber_of == 1].sum(axis=1)
+        
+        time_centers = (np.arange(n_bins) + 0.5) * self.time_bin_size
+        processed = int(left_impulse_bins.sum() + right_impulse_bins.sum())
         
         print(f"Processed {processed} wall collisions")
         
         # Convert to pressure: impulse / (time_interval * perimeter)
         # Pressure units: collisions per second per meter of wall
-        left_pressure = [impulse / (self.time_bin_size * self.left_perimeter) 
-                        for impulse in left_impulse_bins]
-        right_pressure = [impulse / (self.time_bin_size * self.right_perimeter)
-                         for impulse in right_impulse_bins]
+        left_pressure = left_impulse_bins / (self.time_bin_size * self.left_perimeter)
+        right_pressure = right_impulse_bins / (self.time_bin_size * self.right_perimeter)
         
         # Print binning statistics
-        non_zero_left = sum(1 for p in left_pressure if p > 0)
-        non_zero_right = sum(1 for p in right_pressure if p > 0)
+        non_zero_left = int(np.count_nonzero(left_pressure > 0))
+        non_zero_right = int(np.count_nonzero(right_pressure > 0))
         print(f"\\nBinning Results:")
         print(f"Bins with left chamber activity: {non_zero_left}/{n_bins} ({non_zero_left/n_bins*100:.1f}%)")
         print(f"Bins with right chamber activity: {non_zero_right}/{n_bins} ({non_zero_right/n_bins*100:.1f}%)")
@@ -225,7 +329,7 @@ class SimplifiedPressureAnalyzer:
 def plot_pressure_evolution(pressure_data: PressureData, save_path: str | None = None):
     """Create pressure evolution plots"""
     
-    if not pressure_data.time:
+    if not len(pressure_data.time):
         print("No data to plot!")
         return
 
@@ -273,7 +377,7 @@ def main():
         # Calculate pressure evolution
         pressure_data = analyzer.calculate_pressure_evolution(max_events=MAX_FILES)
         
-        if not pressure_data.time:
+        if not len(pressure_data.time):
             print("No pressure data generated. Check simulation output files.")
             return
         
@@ -281,9 +385,9 @@ def main():
         plot_pressure_evolution(pressure_data, save_path=resources.path("pressure_evolution_v2.png"))
         
         # Print summary statistics
-        if pressure_data.left_pressure and pressure_data.right_pressure:
-            avg_left = np.mean(pressure_data.left_pressure)
-            avg_right = np.mean(pressure_data.right_pressure)
+        if len(pressure_data.left_pressure) and len(pressure_data.right_pressure):
+            avg_left = pressure_data.left_pressure.mean()
+            avg_right = pressure_data.right_pressure.mean()
             
             print(f"\\n=== Summary Statistics ===")
             print(f"Average Left Chamber Pressure: {avg_left:.6e} collisions/s/m")
@@ -292,7 +396,7 @@ def main():
             if avg_right > 0:
                 print(f"Pressure Ratio (Left/Right): {avg_left/avg_right:.3f}")
             
-            print(f"Total simulation time: {max(pressure_data.time):.6f} s")
+            print(f"Total simulation time: {pressure_data.time.max():.6f} s")
         
     except FileNotFoundError as e:
         print(f"Error: Required simulation files not found.")
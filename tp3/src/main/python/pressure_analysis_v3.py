@@ -19,16 +19,20 @@ Physics:
 - Event line N corresponds to step file N.txt
 """
 
+import io
+
 import numpy as np
 import matplotlib.pyplot as plt
+from numpy.lib.format import open_memmap
 from dataclasses import dataclass
 from tqdm import tqdm
 import resources
+from pressure_analysis_v2 import EVENT_DTYPE, parse_event_lines
 import os
 import json
 import sys
 from datetime import datetime
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Tuple
 
 MAX_FILES = 2 ** 31 - 1; 
 
@@ -38,29 +42,94 @@ LEFT_CHAMBER_WALL_IDS = [0, 6, 7]  # Exclude connector walls 2 and 4 to avoid bi
 RIGHT_CHAMBER_WALL_IDS = [2, 3, 4]               # Exclude connector walls 1 and 45 to avoid bias
 TIME_PER_BIN = 5.0  # seconds
 
-@dataclass
-class Vector:
-    x: float
-    y: float
 
-    def __str__(self):
-        return f"({self.x:.6f}, {self.y:.6f})"
+def read_step_velocities(step_index: int) -> np.ndarray:
+    """Parse the (vx, vy) columns of a step file, accepting comma decimals"""
+    with open(resources.path(f"steps/{step_index}.txt"), 'rb') as f:
+        content = f.read().replace(b',', b'.')
+
+    # Format: x y vx vy
+    return np.loadtxt(io.BytesIO(content), usecols=(2, 3), ndmin=2)
+
+
+def precompute_steps_npy(step_indices: np.ndarray) -> Tuple[str, str]:
+    """
+    Pack the velocities of the given step files into a single steps.npy of shape (n_indices, n_particles, 2),
+    so the analysis indexes a memory-mapped array instead of opening one text file per collision.
+    Row k holds step file step_indices[k], the indices are saved alongside in steps_index.npy.
+    A missing step file leaves its row as NaN.
+
+    The files are rebuilt only when they are missing, older than events.txt or packed for other steps.
+    """
+    cache = resources.path("steps.npy")
+    index = resources.path("steps_index.npy")
+    if (
+        os.path.exists(cache) and os.path.exists(index)
+        and os.path.getmtime(cache) > os.path.getmtime(resources.path("events.txt"))
+        and np.array_equal(np.load(index), step_indices)
+    ):
+        return cache, index
+
+    # Write under a temporary name so an interrupted run never leaves a valid-looking cache
+    partial = cache + '.partial'
+    steps = None
+    missing: list[int] = []
+    for k, step_index in enumerate(tqdm(step_indices.tolist(), desc="Packing step files")):
+        try:
+            velocity = read_step_velocities(step_index)
+        except FileNotFoundError:
+            print(f"Warning: Step file {resources.path(f'steps/{step_index}.txt')} not found")
+            missing.append(k)
+            continue
+
+        # The first step file read sets the particle count
+        if steps is None:
+            steps = open_memmap(partial, mode='w+', dtype=velocity.dtype, shape=(len(step_indices), *velocity.shape))
+        steps[k] = velocity
+
+    if steps is None:
+        steps = open_memmap(partial, mode='w+', dtype=np.float64, shape=(len(step_indices), 0, 2))
+    steps[missing] = np.nan
+
+    steps.flush()
+    del steps
+
+    with open(index + '.partial', 'wb') as f:
+        np.save(f, step_indices)
+    os.replace(index + '.partial', index)
+    os.replace(partial, cache)
+
+    return cache, index
 
-@dataclass
-class WallCollisionEvent:
-    time: float
-    particle_id: int
-    wall_id: int
-    velocity: Vector
-    step_index: int
-    impulse: float = 0.0
 
+def summarize_pressure(pressure: np.ndarray) -> Tuple[float, int]:
+    """Mean of a pressure series and the number of bins with activity"""
+    return float(pressure.mean()), int(np.count_nonzero(pressure > 0))
 
-@dataclass 
+
+@dataclass(slots=True)
+class WallCollisions:
+    """Wall collisions as parallel arrays, one entry per collision"""
+    time: np.ndarray         # float64
+    particle_id: np.ndarray  # int32
+    wall_id: np.ndarray      # int32
+    velocity: np.ndarray     # (n, 2) float64, (vx, vy) of the particle when it hits the wall
+    step_index: np.ndarray   # int64, line in events.txt and index of its step file
+    impulse: np.ndarray      # float64
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+
+@dataclass(slots=True)
 class PressureData:
-    time: list[float]
-    left_pressure: list[float]
-    right_pressure: list[float]
+    time: np.ndarray
+    left_pressure: np.ndarray
+    right_pressure: np.ndarray
+
+    @classmethod
+    def empty(cls) -> 'PressureData':
+        return cls(np.empty(0), np.empty(0), np.empty(0))
 
 
 class ImpulsePressureAnalyzer:
@@ -106,170 +175,142 @@ class ImpulsePressureAnalyzer:
             7: MAGIC_NUMBER                              # Left wall    (left)
         }
 
-        # Cache for loaded step files to avoid re-reading
-        self.step_cache: Dict[int, List[Tuple[int, Vector]]] = {}
+        # The same mappings as arrays indexed by wall ID, so hot paths gather instead of hashing
+        WALL_IDS = range(len(self.wall_lengths))
+
+        # Velocity component normal to each wall: 1 = vy (horizontal), 0 = vx (vertical)
+        self._wall_axis = np.array([1 if self.wall_orientations[w] == 'horizontal' else 0 for w in WALL_IDS], dtype=np.int8)
+        self._wall_lengths = np.array([self.wall_lengths[w] for w in WALL_IDS], dtype=np.float64)
+        # Chamber of each wall: 0 = left, 1 = right
+        self._wall_chambers = np.array([0 if self.wall_chambers[w] == 'left' else 1 for w in WALL_IDS], dtype=np.int8)
+
+        # Chambers averaged by the pressure kernel: 0 = left, 1 = right, -1 = not averaged (connectors)
+        self._wall_to_chamber = np.full(len(self.wall_lengths), -1, dtype=np.int8)
+        self._wall_to_chamber[LEFT_CHAMBER_WALL_IDS] = 0
+        self._wall_to_chamber[RIGHT_CHAMBER_WALL_IDS] = 1
+
+        # (n_indices, n_particles, 2) velocities at the wall collision steps, memory-mapped on first use
+        self.steps: Optional[np.ndarray] = None
+        self.step_indices: Optional[np.ndarray] = None  # step file of each row in self.steps, sorted
+
     
     def parse_float(self, value_str: str) -> float:
         """Parse float with comma as decimal separator"""
         return float(value_str.replace(',', '.'))
 
-    def get_particle_velocity(self, step_file_path: str, particle_id: int) -> Optional[Vector]:
-        """Extract particle velocity from step file"""
-        try:
-            with open(step_file_path, 'r') as f:
-                for line in f:
-                    parts = line.strip().split()
-                    if len(parts) >= 4:
-                        # Format: x y vx vy radius
-                        vx = self.parse_float(parts[2])
-                        vy = self.parse_float(parts[3])
-                        return Vector(vx, vy)
-                    # If we only have 4 parts, assume it's a different format
-                    # We need to identify particles by line number (particle_id)
-        except FileNotFoundError:
-            print(f"Warning: Step file {step_file_path} not found")
-            return None
-        except Exception as e:
-            print(f"Error reading step file {step_file_path}: {e}")
-            return None
-
-        return None
-
-    def load_step_file_particles(self, step_index: int) -> Dict[int, Vector]:
-        """Load all particles from a step file, mapping particle index to velocity"""
-        if step_index in self.step_cache:
-            return {pid: vel for pid, vel in self.step_cache[step_index]}
+    def load_wall_collisions_with_velocity(self, max_events: Optional[int] = None) -> WallCollisions:
+        """Load wall collisions and corresponding particle velocities"""
 
-        step_file = resources.path(f"steps/{step_index}.txt")
-        particles = {}
+        print("Loading wall collisions with velocity data...")
 
+        # Normalize comma decimals so numpy's C parser reads the whole file in one call
+        with open(resources.path("events.txt"), 'rb') as f:
+            content = f.read().replace(b',', b'.')
+        n_lines = content.count(b'\n') + (len(content) > 0 and not content.endswith(b'\n'))
         try:
-            with open(step_file, 'r') as f:
-                for particle_idx, line in enumerate(f):
-                    parts = line.strip().split()
-                    if len(parts) >= 4:
-                        # Format: x y vx vy radius
-                        vx = self.parse_float(parts[2])
-                        vy = self.parse_float(parts[3])
-                        # Particle IDs start from 2, but file lines start from 0
-                        particles[particle_idx + 2] = Vector(vx, vy)
-
-            # Cache the loaded data
-            self.step_cache[step_index] = list(particles.items())
-
-        except FileNotFoundError:
-            print(f"Warning: Step file {step_file} not found")
-        except Exception as e:
-            print(f"Error reading step file {step_file}: {e}")
-
-        return particles
-
-    def calculate_wall_impulse(self, velocity: Vector, wall_id: int) -> float:
-        """Calculate impulse = 2 * |v_normal| * mass for wall collision"""
-
-        orientation = self.wall_orientations[wall_id]
+            events = np.loadtxt(io.BytesIO(content), dtype=EVENT_DTYPE, ndmin=1)
+            line_index = np.arange(len(events))
+        except ValueError:
+            events = None
+
+        # np.loadtxt drops blank lines, then its rows no longer line up with the step files
+        if events is None or len(events) != n_lines:
+            events, line_index, skipped = parse_event_lines(content)
+            if skipped:
+                print(f"Skipped {skipped} malformed lines")
+
+        # Event line N corresponds to step file N.txt
+        wall_rows = np.flatnonzero(events['type'] == b'W')
+        step_index = line_index[wall_rows]
+        time = events['time'][wall_rows]
+        particle_id = events['particle'][wall_rows]
+        wall_id = events['target'][wall_rows]
+
+        # Only the steps of wall collisions are packed
+        if self.steps is None or self.step_indices is None:
+            steps_path, index_path = precompute_steps_npy(step_index)
+            self.steps = np.load(steps_path, mmap_mode='r')
+            self.step_indices = np.load(index_path)
+        n_particles = self.steps.shape[1]
+        packed = np.searchsorted(self.step_indices, step_index)
+
+        # Particle IDs start from 2, but rows start from 0
+        row = particle_id - 2
+        found = (row >= 0) & (row < n_particles)
+
+        # Gather every velocity at once from the memory-mapped steps, missing step files were packed as NaN
+        velocity = np.full((len(step_index), 2), np.nan)
+        velocity[found] = self.steps[packed[found], row[found]]
+        found &= ~np.isnan(velocity).any(axis=1)
+        known = (wall_id >= 0) & (wall_id < len(self._wall_axis))
+        valid = found & known
+
+        # max_events counts loaded collisions, so cut right after the last one that fits
+        if max_events and np.count_nonzero(valid) > max_events:
+            cut = np.flatnonzero(valid)[max_events - 1] + 1
+            step_index, time, particle_id, wall_id, velocity, found, valid = (
+                a[:cut] for a in (step_index, time, particle_id, wall_id, velocity, found, valid)
+            )
+
+        for i in np.flatnonzero(~valid).tolist():
+            if not found[i]:
+                print(f"Warning: Particle {particle_id[i]} not found in step {step_index[i]}")
+            else:
+                print(f"Error processing wall collision at line {step_index[i] + 1}: unknown wall {wall_id[i]}")
 
-        # Extract normal velocity component
-        if orientation == 'horizontal':
-            v_normal = abs(velocity.y)  # vy for horizontal walls
-        else:  # vertical
-            v_normal = abs(velocity.x)  # vx for vertical walls
+        step_index = step_index[valid]
+        time = time[valid]
+        particle_id = particle_id[valid]
+        wall_id = wall_id[valid]
+        velocity = velocity[valid]
 
-        # impulse = 2 * |v_normal| * mass (elastic collision)
+        # impulse = 2 * |v_normal| * mass, vy is normal to horizontal walls and vx to vertical ones
+        v_normal = np.abs(velocity[np.arange(len(velocity)), self._wall_axis[wall_id]])
         impulse = 2.0 * v_normal * self.particle_mass
 
-        return impulse
-    
-    def load_wall_collisions_with_velocity(self, max_events: Optional[int] = None) -> List[WallCollisionEvent]:
-        """Load wall collisions and corresponding particle velocities"""
-
-        print("Loading wall collisions with velocity data...")
-        wall_collisions: List[WallCollisionEvent] = []
-
-        with open(resources.path("events.txt")) as f:
-            for line_idx, line in enumerate(f):
-                if max_events and len(wall_collisions) >= max_events:
-                    break
-
-                parts = line.strip().split()
-
-                if len(parts) >= 4 and parts[1] == "WALL":
-                    try:
-                        time = self.parse_float(parts[0])
-                        particle_id = int(parts[2])
-                        wall_id = int(parts[3])
-
-                        # Load corresponding step file to get particle velocity
-                        step_particles = self.load_step_file_particles(line_idx)
-
-                        if particle_id in step_particles:
-                            velocity = step_particles[particle_id]
-
-                            # Calculate impulse for this collision
-                            impulse = self.calculate_wall_impulse(velocity, wall_id)
-
-                            wall_collisions.append(WallCollisionEvent(
-                                time=time,
-                                particle_id=particle_id,
-                                wall_id=wall_id,
-                                velocity=velocity,
-                                step_index=line_idx,
-                                impulse=impulse
-                            ))
-                        else:
-                            print(f"Warning: Particle {particle_id} not found in step {line_idx}")
-
-                    except ValueError as e:
-                        print(f"Error parsing wall collision at line {line_idx + 1}: {line.strip()}")
-                        print(f"Error: {e}")
-                        continue
-                    except Exception as e:
-                        print(f"Error processing wall collision at line {line_idx + 1}: {e}")
-                        continue
+        wall_collisions = WallCollisions(
+            time=time,
+            particle_id=particle_id,
+            wall_id=wall_id,
+            velocity=velocity,
+            step_index=step_index,
+            impulse=impulse
+        )
 
         print(f"Loaded {len(wall_collisions)} wall collision events with impulse data")
         return wall_collisions
     
-    def analyze_collision_distribution(self, wall_collisions: List[WallCollisionEvent]):
+    def analyze_collision_distribution(self, wall_collisions: WallCollisions):
         """Analyze the distribution of collision types and wall hits"""
         
-        if not wall_collisions:
+        if not len(wall_collisions):
             return
 
         # Analyze wall collision distribution and impulses
-        wall_counts: Dict[int, int] = {}
-        wall_impulses: Dict[int, float] = {}
-
-        for collision in wall_collisions:
-            wall_id = collision.wall_id
-            wall_counts[wall_id] = wall_counts.get(wall_id, 0) + 1
-            wall_impulses[wall_id] = wall_impulses.get(wall_id, 0.0) + collision.impulse
+        n_walls = len(self._wall_chambers)
+        wall_counts = np.bincount(wall_collisions.wall_id, minlength=n_walls)
+        wall_impulses = np.bincount(wall_collisions.wall_id, weights=wall_collisions.impulse, minlength=n_walls)
         
         print(f"\\nWall Collision Analysis:")
         print(f"Total wall collisions: {len(wall_collisions)}")
 
         print(f"\\nWall Collision Distribution:")
-        left_total_collisions = 0
-        right_total_collisions = 0
-        left_total_impulse = 0.0
-        right_total_impulse = 0.0
-
-        for wall_id in sorted(wall_counts.keys()):
-            count = wall_counts[wall_id]
-            total_impulse = wall_impulses[wall_id]
-            avg_impulse = total_impulse / count if count > 0 else 0.0
+        for wall_id in np.flatnonzero(wall_counts).tolist():
+            count = int(wall_counts[wall_id])
+            total_impulse = float(wall_impulses[wall_id])
+            avg_impulse = total_impulse / count
             chamber = self.wall_chambers.get(wall_id, 'unknown')
 
             print(f"Wall {wall_id} ({chamber}): {count} collisions, "
                   f"total impulse: {total_impulse:.6f} kg⋅m/s, "
                   f"avg impulse: {avg_impulse:.6f} kg⋅m/s")
 
-            if chamber == 'left':
-                left_total_collisions += count
-                left_total_impulse += total_impulse
-            elif chamber == 'right':
-                right_total_collisions += count
-                right_total_impulse += total_impulse
+        left_mask = self._wall_chambers == 0
+        right_mask = self._wall_chambers == 1
+        left_total_collisions = int(wall_counts[left_mask].sum())
+        right_total_collisions = int(wall_counts[right_mask].sum())
+        left_total_impulse = float(wall_impulses[left_mask].sum())
+        right_total_impulse = float(wall_impulses[right_mask].sum())
 
         print(f"\\nChamber Totals:")
         print(f"Left chamber: {left_total_collisions} collisions, {left_total_impulse:.6f} kg⋅m/s total impulse")
@@ -280,104 +321,65 @@ class ImpulsePressureAnalyzer:
         if right_total_impulse > 0:
             print(f"Impulse ratio (Left/Right): {left_total_impulse/right_total_impulse:.3f}")
 
-    def bin_impulses_by_time_and_wall(self, wall_collisions: List[WallCollisionEvent]) -> Tuple[List[float], Dict[int, np.ndarray]]:
-        """Bin wall collisions by time and wall, calculating impulse per wall per bin"""
-
-        if not wall_collisions:
-            return [], {}
-
-        max_time = max(collision.time for collision in wall_collisions)
-        n_bins = int(np.ceil(max_time / self.time_bin_size))
-        time_centers = [(i + 0.5) * self.time_bin_size for i in range(n_bins)]
-
-        # Initialize bins for each wall
-        wall_impulse_bins = {}
-        for wall_id in range(8):  # 8 walls total
-            wall_impulse_bins[wall_id] = np.zeros(n_bins)
-
-        print(f"\\nTime Binning by Wall:")
-        print(f"Max simulation time: {max_time:.6f} s")
-        print(f"Time bin size: {self.time_bin_size:.6f} s")
-        print(f"Number of bins: {n_bins}")
-
-        processed = 0
-        for collision in tqdm(wall_collisions, desc="Binning wall collisions by time and wall"):
-            bin_idx = int(collision.time / self.time_bin_size)
-            if bin_idx >= n_bins:
-                continue
+    def compute_chamber_pressures(self, times: np.ndarray, wall_ids: np.ndarray, impulses: np.ndarray,
+                                  n_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Bin wall collisions straight into average chamber pressures, without per-wall pressure arrays"""
 
-            wall_impulse_bins[collision.wall_id][bin_idx] += collision.impulse
-            processed += 1
+        bin_idx = (times / self.time_bin_size).astype(np.int64)
+        in_range = bin_idx < n_bins
+        print(f"Processed {np.count_nonzero(in_range)} wall collisions into time-wall bins")
 
-        print(f"Processed {processed} wall collisions into time-wall bins")
-        return time_centers, wall_impulse_bins
+        # Connector walls are left out of the averages to avoid bias
+        chamber_ids = self._wall_to_chamber[wall_ids]
+        keep = in_range & (chamber_ids >= 0)
+        bin_idx = bin_idx[keep]
+        wall_ids = wall_ids[keep].astype(np.int64)
+        chamber_ids = chamber_ids[keep].astype(np.int64)
 
-    def calculate_pressure_per_wall(self, wall_impulse_bins: Dict[int, np.ndarray]) -> Dict[int, np.ndarray]:
-        """Calculate pressure per wall: P = Impulse / (Δt × wall_length)"""
+        # Pressure = Force/Length = (Impulse/Δt)/Length, normalized per collision before accumulating
+        pressures = impulses[keep] / (self.time_bin_size * self._wall_lengths[wall_ids])
+        sums = np.bincount(chamber_ids * n_bins + bin_idx, weights=pressures, minlength=2 * n_bins).reshape(2, n_bins)
 
-        wall_pressures = {}
-        for wall_id, impulse_bins in wall_impulse_bins.items():
-            wall_length = self.wall_lengths[wall_id]
-            # Pressure = Force/Length = (Impulse/Δt)/Length
-            wall_pressures[wall_id] = impulse_bins / (self.time_bin_size * wall_length)
+        # Each chamber averages only its walls with non-zero pressure in the bin
+        active = np.unique(wall_ids[pressures > 0] * n_bins + bin_idx[pressures > 0])
+        active_chambers = self._wall_to_chamber[active // n_bins].astype(np.int64)
+        counts = np.bincount(active_chambers * n_bins + active % n_bins, minlength=2 * n_bins).reshape(2, n_bins)
 
-        return wall_pressures  # Units: N/m = kg⋅m/s² / m = kg/(s²⋅m)
-
-    def calculate_chamber_pressures(self, wall_pressures: Dict[int, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
-        """Calculate average chamber pressures from individual wall pressures"""
-
-        n_bins = len(wall_pressures[0])
-        left_pressure = np.zeros(n_bins)
-        right_pressure = np.zeros(n_bins)
-
-        # Collect walls by chamber (excluding connector walls 2 and 4 to avoid bias)
-        left_walls = LEFT_CHAMBER_WALL_IDS  # Pure left chamber walls
-        right_walls = RIGHT_CHAMBER_WALL_IDS            # Pure right chamber walls (exclude connectors 2, 4)
-
-        # Calculate average pressure for left chamber
-        for bin_idx in range(n_bins):
-            left_pressures_in_bin = [wall_pressures[wall_id][bin_idx] for wall_id in left_walls
-                                   if wall_pressures[wall_id][bin_idx] > 0]  # Only non-zero pressures
-            if left_pressures_in_bin:
-                left_pressure[bin_idx] = np.mean(left_pressures_in_bin)
-
-        # Calculate average pressure for right chamber
-        for bin_idx in range(n_bins):
-            right_pressures_in_bin = [wall_pressures[wall_id][bin_idx] for wall_id in right_walls
-                                    if wall_pressures[wall_id][bin_idx] > 0]  # Only non-zero pressures
-            if right_pressures_in_bin:
-                right_pressure[bin_idx] = np.mean(right_pressures_in_bin)
-
-        return left_pressure, right_pressure
+        chamber_pressures = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+        return chamber_pressures[0], chamber_pressures[1]  # Units: N/m = kg⋅m/s² / m = kg/(s²⋅m)
 
     def calculate_pressure_evolution(self, max_events: Optional[int] = None) -> PressureData:
         """Calculate pressure evolution using impulse-based analysis"""
 
         # Load wall collisions with velocity data
         wall_collisions = self.load_wall_collisions_with_velocity(max_events)
-        if not wall_collisions:
-            return PressureData([], [], [])
+        if not len(wall_collisions):
+            return PressureData.empty()
 
         # Analyze collision distribution
         self.analyze_collision_distribution(wall_collisions)
 
-        # Bin impulses by time and wall
-        time_centers, wall_impulse_bins = self.bin_impulses_by_time_and_wall(wall_collisions)
+        max_time = float(wall_collisions.time.max())
+        n_bins = int(np.ceil(max_time / self.time_bin_size))
+        time_centers = (np.arange(n_bins) + 0.5) * self.time_bin_size
+
+        print(f"\\nTime Binning by Wall:")
+        print(f"Max simulation time: {max_time:.6f} s")
+        print(f"Time bin size: {self.time_bin_size:.6f} s")
+        print(f"Number of bins: {n_bins}")
 
         if len(time_centers) == 0:
             print("Error: No time bins generated!")
-            return PressureData([], [], [])
+            return PressureData.empty()
 
-        # Calculate pressure per wall
-        wall_pressures = self.calculate_pressure_per_wall(wall_impulse_bins)
-
-        # Calculate average chamber pressures
-        left_pressure, right_pressure = self.calculate_chamber_pressures(wall_pressures)
+        # Bin impulses by time and chamber, already normalized to pressures
+        left_pressure, right_pressure = self.compute_chamber_pressures(
+            wall_collisions.time, wall_collisions.wall_id, wall_collisions.impulse, n_bins
+        )
 
         # Print binning statistics
-        non_zero_left = sum(1 for p in left_pressure if p > 0)
-        non_zero_right = sum(1 for p in right_pressure if p > 0)
-        n_bins = len(time_centers)
+        non_zero_left = np.count_nonzero(left_pressure > 0)
+        non_zero_right = np.count_nonzero(right_pressure > 0)
 
         print(f"\nPressure Calculation Results:")
         print(f"Bins with left chamber activity: {non_zero_left}/{n_bins} ({non_zero_left/n_bins*100:.1f}%)")
@@ -385,13 +387,13 @@ class ImpulsePressureAnalyzer:
         print(f"Average left pressure: {np.mean(left_pressure):.6e} N/m")
         print(f"Average right pressure: {np.mean(right_pressure):.6e} N/m")
 
-        return PressureData(time_centers, left_pressure.tolist(), right_pressure.tolist())
+        return PressureData(time_centers, left_pressure, right_pressure)
 
     def export_simulation_data(self, pressure_data: PressureData, L: float, particle_radius: float,
                               particle_count: int, export_path: str):
         """Export simulation data to JSON for ideal gas law analysis"""
 
-        if not pressure_data.time:
+        if not len(pressure_data.time):
             print("No pressure data to export!")
             return
 
@@ -401,11 +403,19 @@ class ImpulsePressureAnalyzer:
         stationary_right = pressure_data.right_pressure[stationary_start_idx:]
 
         # Filter out zero values and calculate averages
-        left_nonzero = [p for p in stationary_left if p > 0]
-        right_nonzero = [p for p in stationary_right if p > 0]
+        left_nonzero = stationary_left[stationary_left > 0]
+        right_nonzero = stationary_right[stationary_right > 0]
+
+        avg_left = float(left_nonzero.mean()) if left_nonzero.size else 0.0
+        avg_right = float(right_nonzero.mean()) if right_nonzero.size else 0.0
+
+        # Whole-series statistics, one pass per chamber
+        overall_left, active_left = summarize_pressure(pressure_data.left_pressure)
+        overall_right, active_right = summarize_pressure(pressure_data.right_pressure)
 
-        avg_left = np.mean(left_nonzero) if left_nonzero else 0.0
-        avg_right = np.mean(right_nonzero) if right_nonzero else 0.0
+        # Bin centers are increasing, and the stationary start always falls inside the series
+        total_time = float(pressure_data.time[-1])
+        stationary_start = float(pressure_data.time[stationary_start_idx])
 
         # Calculate effective areas (accounting for particle radius)
         effective_width = MAGIC_NUMBER - particle_radius
@@ -436,7 +446,7 @@ class ImpulsePressureAnalyzer:
                 "L": L,
                 "particle_radius": particle_radius,
                 "particle_count": particle_count,
-                "total_simulation_time": max(pressure_data.time) if pressure_data.time else 0.0,
+                "total_simulation_time": total_time,
                 "time_bin_size": self.time_bin_size,
                 "magic_number": MAGIC_NUMBER
             },
@@ -448,8 +458,8 @@ class ImpulsePressureAnalyzer:
                 "right_chamber_dimensions": f"{effective_width:.6f} x {L - particle_radius:.6f}"
             },
             "pressure_analysis": {
-                "stationary_period_start": pressure_data.time[stationary_start_idx] if stationary_start_idx < len(pressure_data.time) else 0.0,
-                "stationary_period_duration": max(pressure_data.time) - (pressure_data.time[stationary_start_idx] if stationary_start_idx < len(pressure_data.time) else 0.0),
+                "stationary_period_start": stationary_start,
+                "stationary_period_duration": total_time - stationary_start,
                 "left_chamber_pressure": avg_left,
                 "right_chamber_pressure": avg_right,
                 "area_weighted_total_pressure": area_weighted_pressure,
@@ -458,10 +468,10 @@ class ImpulsePressureAnalyzer:
             },
             "temporal_data": {
                 "total_time_bins": len(pressure_data.time),
-                "bins_with_left_activity": sum(1 for p in pressure_data.left_pressure if p > 0),
-                "bins_with_right_activity": sum(1 for p in pressure_data.right_pressure if p > 0),
-                "overall_avg_left_pressure": np.mean(pressure_data.left_pressure),
-                "overall_avg_right_pressure": np.mean(pressure_data.right_pressure)
+                "bins_with_left_activity": active_left,
+                "bins_with_right_activity": active_right,
+                "overall_avg_left_pressure": overall_left,
+                "overall_avg_right_pressure": overall_right
             },
             "ideal_gas_analysis": {
                 "PA_product": area_weighted_pressure * total_effective_area,
@@ -485,7 +495,7 @@ class ImpulsePressureAnalyzer:
 def plot_pressure_evolution(pressure_data: PressureData, save_path: str | None = None):
     """Create pressure evolution plots"""
     
-    if not pressure_data.time:
+    if not len(pressure_data.time):
         print("No data to plot!")
         return
 
@@ -518,8 +528,8 @@ def plot_pressure_evolution(pressure_data: PressureData, save_path: str | None =
     stationary_left = pressure_data.left_pressure[stationary_start_idx:]
     stationary_right = pressure_data.right_pressure[stationary_start_idx:]
 
-    avg_left_stationary = np.mean(stationary_left) if stationary_left else 0
-    avg_right_stationary = np.mean(stationary_right) if stationary_right else 0
+    avg_left_stationary = np.mean(stationary_left) if len(stationary_left) else 0
+    avg_right_stationary = np.mean(stationary_right) if len(stationary_right) else 0
 
     chambers = ['Left Chamber', 'Right Chamber']
     pressures = [avg_left_stationary, avg_right_stationary]
@@ -577,7 +587,7 @@ def main():
         # Calculate pressure evolution
         pressure_data = analyzer.calculate_pressure_evolution(max_events=MAX_FILES)
 
-        if not pressure_data.time:
+        if not len(pressure_data.time):
             print("No pressure data generated. Check simulation output files.")
             return
 
@@ -588,7 +598,7 @@ def main():
             with open(resources.path("setup.txt")) as f:
                 first_line = f.readline().strip().split()
                 particle_count = int(first_line[0])
-                L = float(first_line[1].replace(',', '.'))
+                L = analyzer.parse_float(first_line[1])
         except Exception as e:
             print(f"Warning: Could not read simulation parameters from setup.txt: {e}")
             L = RIGHT_CHAMBER_HEIGHT  # Fallback to default
@@ -604,7 +614,7 @@ def main():
         plot_pressure_evolution(pressure_data, save_path=resources.path("pressure_evolution_v3.png"))
 
         # Print summary statistics
-        if pressure_data.left_pressure and pressure_data.right_pressure:
+        if len(pressure_data.left_pressure) and len(pressure_data.right_pressure):
             avg_left = np.mean(pressure_data.left_pressure)
             avg_right = np.mean(pressure_data.right_pressure)
             
@@ -613,8 +623,8 @@ def main():
             stationary_left = pressure_data.left_pressure[stationary_start_idx:]
             stationary_right = pressure_data.right_pressure[stationary_start_idx:]
 
-            avg_left_stationary = np.mean(stationary_left) if stationary_left else 0
-            avg_right_stationary = np.mean(stationary_right) if stationary_right else 0
+            avg_left_stationary = np.mean(stationary_left) if len(stationary_left) else 0
+            avg_right_stationary = np.mean(stationary_right) if len(stationary_right) else 0
 
             print(f"\\n=== Summary Statistics ===")
             print(f"Overall Average Left Chamber Pressure: {avg_left:.6e} N/m")
@@ -630,8 +640,8 @@ def main():
             if avg_right_stationary > 0:
                 print(f"Stationary Pressure Ratio (Left/Right): {avg_left_stationary/avg_right_stationary:.3f}")
 
-            print(f"Total simulation time: {max(pressure_data.time):.6f} s")
-            print(f"Stationary analysis period: {pressure_data.time[stationary_start_idx]:.6f} - {max(pressure_data.time):.6f} s")
+            print(f"Total simulation time: {pressure_data.time.max():.6f} s")
+            print(f"Stationary analysis period: {pressure_data.time[stationary_start_idx]:.6f} - {pressure_data.time.max():.6f} s")
         
     except FileNotFoundError as e:
         print(f"Error: Required simulation files not found.")
@@ -2,6 +2,9 @@ from classes.particle import Particle
 from classes.event import Event
 from classes.wall import Wall
 import math
+import heapq
+
+import numpy as np
 
 Collideable = Particle | Wall
 
@@ -9,8 +12,28 @@ Collideable = Particle | Wall
 def setup_simulation(L: float) -> tuple[list[Particle], list[Wall]]:
     return [], []
 
+# Fake, the event is stamped with the absolute time of the collision, now + time until it
+def collision_time(p1: Particle, p2: Collideable, now: float) -> Event:
+    return Event(0, [])
+
+# Times until particle i hits every particle, all at once, inf where they never touch (and for i itself)
+def collision_times(i: int, positions: np.ndarray, velocities: np.ndarray, radii: np.ndarray) -> np.ndarray:
+    DR = positions - positions[i]
+    DV = velocities - velocities[i]
+    SIGMA = radii + radii[i]
+
+    DVDR = np.einsum('ij,ij->i', DV, DR)
+    DVDV = np.einsum('ij,ij->i', DV, DV)
+    DRDR = np.einsum('ij,ij->i', DR, DR)
+    D = DVDR ** 2 - DVDV * (DRDR - SIGMA ** 2)
+
+    # Only approaching pairs with a real root collide, the rest are masked to inf
+    with np.errstate(divide='ignore', invalid='ignore'):
+        T = -(DVDR + np.sqrt(D)) / DVDV
+    return np.where((DVDR < 0) & (D >= 0), T, math.inf)
+
 # Fake
-def collision_time(p1: Particle, p2: Collideable) -> Event:
+def particle_event(time: float, a: int, b: int) -> Event:
     return Event(0, [])
 
 # Fake
@@ -24,33 +47,67 @@ def w_collision(a: Particle, b: Wall):
 def write_output(_: str):
     return
 
-Invalid = Event(0, [])
+class PriorityQueue:
+    """
+    Min-heap of events keyed by absolute simulation time.
+
+    Every particle carries a collision count. An event remembers the counts of its particles when
+    it is pushed, and is dropped on pop if any of them collided since, so stale events never have
+    to be searched for and removed.
+    """
 
-class PriorityQueue(list[Event]):
-    pass
+    def __init__(self, n: int):
+        self.heap: list[tuple[float, int, int, int, Event]] = []
+        self.counts = [0] * n
+        self.pushed = 0
+
+    def push(self, event: Event):
+        COUNT_B = self.counts[event.b] if event.type == 'PARTICLE' else -1
+
+        # pushed breaks ties between equal times, so events are never compared
+        heapq.heappush(self.heap, (event.time, self.pushed, self.counts[event.a], COUNT_B, event))
+        self.pushed += 1
+
+    def pop(self) -> Event:
+        while True:
+            _, _, COUNT_A, COUNT_B, event = heapq.heappop(self.heap)
+            if COUNT_A == self.counts[event.a] and (event.type != 'PARTICLE' or COUNT_B == self.counts[event.b]):
+                return event
+
+    def collided(self, event: Event):
+        self.counts[event.a] += 1
+        if event.type == 'PARTICLE':
+            self.counts[event.b] += 1
 
 L = 0
 steps = 0
+now = 0.0  # Simulation clock, time of the last processed event
 particles: list[Particle]
-collideables: list[Collideable]
+walls: list[Wall]
 queue: PriorityQueue
 
-def compute_collision_time(p: Particle):
-    for c in collideables:
-        event = collision_time(p, c)
+# Particle state as arrays, row i is particles[i]
+positions: np.ndarray
+velocities: np.ndarray
+radii: np.ndarray
+
+def compute_collision_time(i: int):
+    for w in walls:
+        event = collision_time(particles[i], w, now)
         if event.time < math.inf:
-            queue.append(event)
+            queue.push(event)
+
+    # Times are relative to the current state, the queue compares absolute times
+    TIMES = collision_times(i, positions, velocities, radii)
+    for j in np.flatnonzero(TIMES < math.inf).tolist():
+        queue.push(particle_event(now + TIMES[j], i, j))
 
 def set_initial_collision_time():
-    for p in particles:
-        for c in collideables:
-            event = collision_time(p, c)
-            if event.time < math.inf:
-                queue.append(event)
+    for i in range(len(particles)):
+        compute_collision_time(i)
 
 def advance_particles(time: float):
-    for p in particles:
-        p.position = p.position + p.velocity * time
+    positions[:] += velocities * time
 
 def collide(p: Particle, c: Collideable):
     if isinstance(c, Wall):
@@ -59,21 +116,23 @@ def collide(p: Particle, c: Collideable):
         p.velocity, c.velocity = p_collision(p, c)
 
 def run_simulation(steps: int, L: float):
+    global queue, now
     setup_simulation(L)
+    now = 0.0
 
-    queue = PriorityQueue()
+    queue = PriorityQueue(len(particles))
     set_initial_collision_time()
 
     for _ in range(steps):
-        event: Event | None = None
-        while not event or event == Invalid:
-            event = queue.pop()
+        event = queue.pop()
 
-        advance_particles(event.time)
+        advance_particles(event.time - now)
+        now = event.time
         collide(event.a, event.b)
+        queue.collided(event)
 
         compute_collision_time(event.a)
-        if isinstance(event.b, Particle):
+        if event.type == 'PARTICLE':
             compute_collision_time(event.b)
 
 def main():
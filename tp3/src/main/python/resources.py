@@ -16,7 +16,6 @@ def path(*name: str):
     """
     return pth.abspath(pth.join(pth.dirname(__file__), 'simulations', *name))
 
-@cache
 def config(file: str | None = None) -> dict[str, str | int | float]:
     """
     Reads the initial conditions from the JSON configuration file.
@@ -24,17 +23,13 @@ def config(file: str | None = None) -> dict[str, str | int | float]:
     .. deprecated:: Config files are not used anymore.
     :return: A dictionary containing the configuration.
     """
-    config_path = path(file if file is not None else 'initial_conditions.json')
-
-    try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError as e:
-        print(f"Error: The file '{config_path}' was not found.")
-        raise e
-    except json.JSONDecodeError as e:
-        print(f"Error: Could not decode JSON from '{config_path}'. Check file format.")
-        raise e
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        raise e
+    return _config(path(file if file is not None else 'initial_conditions.json'))
+
+@cache
+def _config(config_path: str) -> dict[str, str | int | float]:
+    """
+    Parses a configuration file, cached by its absolute path
+    so different spellings of the same file share one entry.
+    """
+    with open(config_path, 'rb') as f:
+        return json.load(f)
@@ -1,10 +1,11 @@
-from typing import Callable
-
 import time
+import queue
+import threading
 
+import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.patches import Circle
-from matplotlib.animation import FuncAnimation
+from matplotlib.collections import EllipseCollection, LineCollection
+from matplotlib.animation import FuncAnimation, FFMpegWriter
 
 from tqdm import tqdm
 
@@ -12,9 +13,6 @@ import frames
 import resources
 from streaming import SequentialStreamingExecutor as Executor
 
-from classes.wall import Wall
-from classes.particle import Particle
-
 abar = None
 def main():
     global abar
@@ -23,9 +21,8 @@ def main():
         count, L = [*map(float, f.readline().strip().split())]
         count = int(count)
 
-        walls = [Wall(*map(float, line.strip().split())) for line in f]
-
-    executor = Executor(frames.next, frames.checkpoints())
+        # One (x1, y1, x2, y2) row per wall, parsed in a single call
+        walls = np.loadtxt(f, ndmin=2)
 
     fig, ax = plt.subplots() # pyright: ignore[reportUnknownMemberType]
     ax.set_aspect('equal', adjustable="box")
@@ -38,52 +35,111 @@ def main():
         0.09
     ])
 
-    for wall in walls:
-        ax.plot([wall.start.x, wall.end.x], [wall.start.y, wall.end.y], color="black") # pyright: ignore[reportUnknownMemberType]
-
-    circles: list[Circle] = []
-    for p in frames.next(0)[1]:
-        c = Circle((p.position.x, p.position.y), radius=p.radius, color="blue")
-        ax.add_patch(c)
-        circles.append(c)
+    # Every wall as one (start, end) segment of a single artist
+    ax.add_collection(LineCollection(walls.reshape(-1, 2, 2), colors="black"))
+    ax.autoscale_view() # collections don't rescale the axes on their own
+
+    RADIUS = 0.0015
+    FRAME_COUNT = frames.count()
+    DPI = 150 # Flat circles on a white background, more pixels only add encoder work
+
+    # All particles in one artist, so a frame is a single offsets update and draw call
+    positions = frames.positions(0)[1]
+    circles = EllipseCollection(
+        widths=2 * RADIUS,
+        heights=2 * RADIUS,
+        angles=0,
+        units='xy',
+        offsets=positions,
+        offset_transform=ax.transData,
+        color="blue"
+    )
+    ax.add_collection(circles)
 
-    def update(particles: list[Particle]):
+    def update(positions: np.ndarray):
         global abar
 
-        if abar is not None and abar.n % abar.total == 0:
+        if abar is not None and abar.n % FRAME_COUNT == 0:
             abar.reset()
 
-        for i, particle in enumerate(particles):
-            circles[i].center = particle.position.tuple()
-            circles[i].radius = particle.radius
+        circles.set_offsets(positions)
 
         if abar is not None:
             abar.update()
 
-        return circles
-
-    ani = FuncAnimation( # pyright: ignore[reportUnusedVariable]
-        fig,
-        update,
-        frames=executor.stream(),
-        save_count=frames.count(),
-        interval=5,
-        blit=True,
-        repeat=True
-    )
+        return [circles]
 
     if True:
-        abar = tqdm(total=frames.count())
-        plt.show() # pyright: ignore[reportUnknownMemberType]
-        abar.close()
+        executor = Executor(frames.positions, frames.checkpoints())
+
+        ani = FuncAnimation( # pyright: ignore[reportUnusedVariable]
+            fig,
+            update,
+            frames=executor.stream(),
+            save_count=FRAME_COUNT,
+            interval=5,
+            blit=True,
+            repeat=True
+        )
+
+        abar = tqdm(total=FRAME_COUNT)
+        try:
+            plt.show() # pyright: ignore[reportUnknownMemberType]
+        finally:
+            abar.close()
+            abar = None
+            executor.close()
 
     if True:
         print("Saving animation...")
 
+        # Feed ffmpeg frame by frame, without FuncAnimation's per-frame bookkeeping
+        executor = Executor(frames.positions, frames.checkpoints())
+        writer = FFMpegWriter(
+            fps=60,
+            codec='h264',
+            extra_args=['-preset', 'veryfast', '-crf', '23', '-pix_fmt', 'yuv420p', '-tune', 'animation']
+        )
+
+        # Pull frames from the workers in the background while the current one renders and encodes,
+        # a worker error is passed along to be raised here instead of ending the video early
+        prefetched: queue.Queue[np.ndarray | BaseException | None] = queue.Queue(maxsize=4)
+        stopped = threading.Event()
+
+        def prefetch():
+            try:
+                for positions in executor.stream():
+                    if stopped.is_set():
+                        return
+                    prefetched.put(positions)
+            except BaseException as e:
+                prefetched.put(e)
+            else:
+                prefetched.put(None)
+
+        prefetcher = threading.Thread(target=prefetch, daemon=True)
+        prefetcher.start()
+
         filename = resources.path(f"{int(time.time())}.mp4")
-        with tqdm(total=frames.count()) as sbar:
-            callback: Callable[[int, int], bool | None] = lambda _i, _n: sbar.update()
-            ani.save(filename, writer='ffmpeg', fps=60, dpi=300, progress_callback=callback)
+        try:
+            with writer.saving(fig, filename, dpi=DPI), tqdm(total=FRAME_COUNT) as sbar:
+                while (positions := prefetched.get()) is not None:
+                    if isinstance(positions, BaseException):
+                        raise positions
+
+                    update(positions)
+                    writer.grab_frame()
+                    sbar.update()
+        finally:
+            stopped.set()
+            executor.close()
+
+            # Drain the queue so the prefetch thread isn't left blocked on a full one
+            while prefetcher.is_alive():
+                try:
+                    prefetched.get(timeout=0.1)
+                except queue.Empty:
+                    pass
 
         print(f"Animation saved at {filename}")
 
@@ -1,65 +1,170 @@
 from typing import Callable, Iterable
 
+import os
+import atexit
 import multiprocessing as mp
-from multiprocessing.managers import DictProxy
+from collections import deque
+from itertools import batched
+from multiprocessing.pool import AsyncResult, Pool
+
+_POOL: Pool | None = None
+
+def get_pool() -> Pool:
+    """
+    Returns the process pool shared by every executor, starting it on first use.
+
+    Reusing one pool avoids paying the worker startup on each executor.
+    It is terminated when the interpreter exits.
+
+    :return: A pool with one worker per CPU.
+    """
+    global _POOL
+
+    if _POOL is None:
+        _POOL = mp.Pool(os.cpu_count())
+        atexit.register(_POOL.terminate)
+
+    return _POOL
+
+class _Window[I, O]:
+    """
+    Keeps a bounded number of chunks of a task in flight on a pool.
+
+    Chunks are submitted from the consumer's side as their results are taken,
+    so the pool's task handler thread, shared by every executor, only ever
+    receives finished lists and never waits on a slow consumer.
+    """
+
+    def __init__(self, pool: Pool, task: Callable[[I], tuple[I, O]], inputs: Iterable[I], chunksize: int, size: int):
+        """
+        Submits the first chunks right away, so they run while the consumer sets up.
+
+        :param pool: The pool to run the tasks on.
+        :param task: A callable that takes an input and returns it with its result.
+        :param inputs: The inputs to execute the task on, in output order.
+        :param chunksize: The number of inputs sent to a worker at once.
+        :param size: The number of chunks in flight or waiting to be consumed.
+        """
+        self.pool = pool
+        self.task = task
+        self.chunks = batched(inputs, chunksize)
+        self.in_flight: deque[AsyncResult[list[tuple[I, O]]]] = deque()
+        self.closed = False
+
+        for _ in range(size):
+            self.submit()
+
+    def submit(self):
+        """
+        Hands the next chunk of inputs to the pool, unless none is left or the window is closed.
+        """
+        if self.closed:
+            return
+
+        chunk = next(self.chunks, None)
+        if chunk is not None:
+            self.in_flight.append(self.pool.map_async(self.task, chunk, len(chunk)))
+
+    def results(self):
+        """
+        Generator that yields the task results in input order.
+
+        :return: A generator yielding (input, output) pairs.
+        """
+        while self.in_flight:
+            chunk = self.in_flight.popleft().get()
+
+            # Refill the window before handing the chunk out, so the workers stay busy
+            self.submit()
+            yield from chunk
+
+    def close(self):
+        """
+        Stops submitting chunks. Chunks already submitted finish in the background.
+        """
+        self.closed = True
 
 class SequentialStreamingExecutor[I, O]:
     """
     Executor that streams results sequentially from a task.
     """
 
-    def __init__(self, task: Callable[[I], tuple[I, O]], inputs: Iterable[I]):
+    def __init__(self, task: Callable[[I], tuple[I, O]], inputs: Iterable[I], pool: Pool | None = None):
         """
         Initializes the executor with a task to execute.
 
-        Starts a multiprocessing pool and a manager to handle shared state.
-
-        :param task: A callable that takes an integer (the task index) and returns a result.
-        :param count: The number of tasks required to execute.
-        """
-        self.manager = mp.Manager()
-        self.shared_dict: DictProxy[I, O] = self.manager.dict()
-        self.condition = self.manager.Condition()
-        self.pool = mp.Pool()
-        self.inputs = inputs
-        self.count = 0
-
-        def done(result: tuple[I, O]):
-            input, output = result
-            try:
-                with self.condition:
-                    self.shared_dict[input] = output
-                    self.condition.notify_all()
-            except EOFError:
-                # Closed semaphore
-                pass
-
-        for i in inputs:
-            self.count += 1
-            self.pool.apply_async(
-                task,
-                args=(i,),
-                callback=done,
-                error_callback=lambda e: print(f"Error in task {i}: {e}")
-            )
-        self.pool.close()
+        Hands the inputs to the pool's workers in chunks and streams the results
+        back in input order through a single iterator.
+
+        :param task: A callable that takes an input and returns it with its result.
+        :param inputs: The inputs to execute the task on, in output order.
+        :param pool: The pool to run the tasks on, the shared one by default.
+        """
+        self.pool = pool if pool is not None else get_pool()
+        self.inputs = list(inputs)
+        self.count = len(self.inputs)
+
+        # A few chunks per worker keeps them balanced without one submission per input
+        workers = os.cpu_count() or 1
+        chunksize = max(1, min(self.count // (4 * workers), 64))
+
+        # Two chunks per worker in flight, so a slow consumer doesn't pile up every frame in memory
+        self.window = _Window(self.pool, task, self.inputs, chunksize, 2 * workers)
 
     def stream(self):
         """
         Generator that yields results as they become available.
 
-        :return: A generator yielding lists of particles.
+        :return: A generator yielding the task outputs, in input order.
+        """
+        for _, output in self.window.results():
+            yield output
+
+    def close(self):
+        """
+        Releases the executor.
+
+        Stops handing inputs to the pool, which is shared and left running
+        for other executors. Tasks already dispatched finish in the background.
+        """
+        self.window.close()
+
+class PrefetchingStreamingExecutor[I, O]:
+    """
+    Executor that streams results in order while workers read ahead.
+    """
+
+    def __init__(self, task: Callable[[I], tuple[I, O]], inputs: Iterable[I], chunksize: int = 64, pool: Pool | None = None):
+        """
+        Initializes the executor with a task to execute.
+
+        Hands the inputs to the pool's workers in chunks,
+        so many small tasks don't pay one round-trip each.
+
+        :param task: A callable that takes an input and returns it with its result.
+        :param inputs: The inputs to execute the task on, in output order.
+        :param chunksize: The number of inputs sent to a worker at once.
+        :param pool: The pool to run the tasks on, the shared one by default.
+        """
+        self.pool = pool if pool is not None else get_pool()
+
+        # Two chunks per worker in flight, so a slow consumer doesn't pile up every result in memory
+        self.window = _Window(self.pool, task, inputs, chunksize, 2 * (os.cpu_count() or 1))
+
+    def stream(self):
+        """
+        Generator that yields results in input order as they become available.
+
+        :return: A generator yielding the task outputs.
         """
-        for input in self.inputs:
-            try:
-                with self.condition:
-                    self.condition.wait_for(lambda: input in self.shared_dict)
-                    result = self.shared_dict.pop(input)
-                    yield result
-            except FileNotFoundError:
-                # If the pool is closed, we stop yielding results
-                break
+        for _, output in self.window.results():
+            yield output
 
     def close(self):
-        self.pool.terminate()
-        self.manager.shutdown()
+        """
+        Releases the executor.
+
+        Stops handing inputs to the pool, which is shared and left running
+        for other executors. Tasks already dispatched finish in the background.
+        """
+        self.window.close()